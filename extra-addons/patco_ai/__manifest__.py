@@ -5,7 +5,7 @@
     'license': 'LGPL-3',
     'author': 'PATCO',
     'website': 'https://patcoperu.com',
-    'depends': ['base', 'mail', 'maintenance', 'patco_equipment', 'patco_manuales'],
+    'depends': ['base', 'mail', 'maintenance', 'queue_job', 'patco_equipment', 'patco_manuales'],
     'data': [
         'security/ir.model.access.csv',
         'data/ai_bot_user.xml',
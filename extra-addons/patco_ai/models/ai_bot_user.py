@@ -7,20 +7,30 @@ class AIBotUser(models.TransientModel):
 
     @api.model
     def ensure_bot(self):
-        bot = self.env['res.users'].sudo().search([('login', '=', 'odoo_bot')], limit=1)
-        if not bot:
-            bot = self.env['res.users'].sudo().create({
-                'name': 'Odoo Bot',
-                'login': 'odoo_bot',
-                'email': 'odoo_bot',
-            })
         icp = self.env['ir.config_parameter'].sudo()
-        icp.set_param('ai.bot_user_xmlid', 'patco_ai.user_odoo_bot')
-        if bot.partner_id:
-            icp.set_param('ai.bot_partner_id', str(bot.partner_id.id))
-        # Always disable native OdooBot onboarding per user
+        # Already ensured: get_param is ormcached, skip the search/setup below
+        # unless the recorded partner no longer belongs to the odoo_bot user.
+        bot = self.env['res.users']
+        pid = icp.get_param('ai.bot_partner_id')
+        if pid:
+            partner = self.env['res.partner'].sudo().browse(int(pid)).exists()
+            bot = partner.user_ids.filtered(lambda u: u.login == 'odoo_bot')[:1]
+        if not bot:
+            bot = self.env['res.users'].sudo().search([('login', '=', 'odoo_bot')], limit=1)
+            if not bot:
+                bot = self.env['res.users'].sudo().create({
+                    'name': 'Odoo Bot',
+                    'login': 'odoo_bot',
+                    'email': 'odoo_bot',
+                })
+                self.env.registry.clear_cache()
+            icp.set_param('ai.bot_user_xmlid', 'patco_ai.user_odoo_bot')
+            if bot.partner_id:
+                icp.set_param('ai.bot_partner_id', str(bot.partner_id.id))
+        # Always disable native OdooBot onboarding per user; only users that
+        # still have it enabled are written
         try:
-            self.env['res.users'].sudo().search([]).write({'odoobot_state': 'disabled'})
+            self.env['res.users'].sudo().search([('odoobot_state', '!=', 'disabled')]).write({'odoobot_state': 'disabled'})
         except Exception:
             pass
-        return bot.id
\ No newline at end of file
+        return bot.id
@@ -1,12 +1,64 @@
+from contextlib import contextmanager
+
+import odoo
 from odoo import models
 from odoo.modules.module import get_module_resource
+from odoo.tools import SQL, ormcache
 import base64
 
+# The bundled avatar never changes at runtime: encode it once per process
+_BOT_AVATAR_B64 = None
+
 
 class PatcoAISetup(models.AbstractModel):
     _name = 'patco.ai.setup'
     _description = 'PATCO AI Setup Utilities'
 
+    def _set_params_bulk(self, pairs):
+        # set_param() has no batch API: upsert all keys in one statement
+        pairs = dict(pairs)
+        if not pairs:
+            return
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO ir_config_parameter (key, value, create_uid, write_uid, create_date, write_date)
+            SELECT v.key, v.value, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC'
+              FROM (VALUES %s) AS v(key, value)
+            ON CONFLICT (key) DO UPDATE
+               SET value = EXCLUDED.value,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+            """,
+            self.env.uid,
+            self.env.uid,
+            SQL(", ").join(SQL("(%s, %s)", str(key), str(value)) for key, value in pairs.items()),
+        ))
+        ICP.invalidate_model(['value'])
+        self.env.registry.clear_cache()
+
+    @contextmanager
+    def _temp_param(self, key, value, default=''):
+        # Restores the previous value (or default) even if the body raises
+        icp = self.env['ir.config_parameter'].sudo()
+        prev = icp.get_param(key)
+        icp.set_param(key, value)
+        try:
+            yield
+        finally:
+            icp.set_param(key, prev or default)
+
+    def _resolve_bot_user(self):
+        # Identify our bot strictly by login/email 'odoo_bot'
+        return self.env['res.users'].sudo().search(['|', ('login', '=', 'odoo_bot'), ('email', '=', 'odoo_bot')], limit=1)
+
+    @ormcache()
+    def _cached_bot_partner_id(self):
+        # Cleared whenever ir.config_parameter changes (set_param or
+        # _set_params_bulk) and when ensure_bot() creates the bot
+        return self._resolve_bot_user().partner_id.id or False
+
     def disable_native_odoobot(self):
         users = self.env['res.users'].sudo().search([])
         if users:
@@ -16,78 +68,79 @@ class PatcoAISetup(models.AbstractModel):
                 pass
 
     def prune_channels(self):
-        Users = self.env['res.users'].sudo()
         Partners = self.env['res.partner'].sudo()
         Discuss = self.env['discuss.channel'].sudo()
         # Identify any native OdooBot-like partners distinct from our bot
-        our_bot = Users.search([('login', '=', 'odoo_bot')], limit=1)
-        our_partner = our_bot.partner_id if our_bot else False
+        our_partner = Partners.browse(self._cached_bot_partner_id())
         candidates = Partners.search([('name', 'ilike', 'OdooBot')])
         native_partners = candidates
         if our_partner:
             native_partners = candidates.filtered(lambda p: p.id != our_partner.id)
         if not native_partners:
             return
+        native_ids = set(native_partners.ids)
+        # Resolve the membership field once on the model, not per channel
+        if 'channel_partner_ids' in Discuss._fields:
+            member_path = 'channel_partner_ids'
+        elif 'member_ids' in Discuss._fields:
+            member_path = 'member_ids.partner_id'
+        else:
+            member_path = None
         chans = Discuss.search([])
         for ch in chans:
-            members = False
-            if hasattr(ch, 'channel_partner_ids'):
-                members = ch.channel_partner_ids
-            elif hasattr(ch, 'member_ids'):
-                members = ch.member_ids.mapped('partner_id')
-            members = members or Partners
-            for np in native_partners:
-                if np in members:
-                    try:
-                        ch.sudo().remove_members(np)
-                    except Exception:
-                        try:
-                            ch.sudo().write({'channel_partner_ids': [(3, np.id)]})
-                        except Exception:
-                            pass
-                ctype = getattr(ch, 'channel_type', '') or getattr(ch, 'channel_type_name', '')
-                if ctype in ('chat','direct','direct_message','private'):
-                    try:
-                        ch.sudo().unlink()
-                    except Exception:
-                        pass
+            member_ids = ch.mapped(member_path).ids if member_path else []
+            overlap_ids = native_ids.intersection(member_ids)
+            if overlap_ids:
+                try:
+                    ch.sudo().write({'channel_partner_ids': [(3, pid) for pid in overlap_ids]})
+                except Exception:
+                    pass
+            ctype = getattr(ch, 'channel_type', '') or getattr(ch, 'channel_type_name', '')
+            if ctype in ('chat','direct','direct_message','private'):
+                try:
+                    ch.sudo().unlink()
+                except Exception:
+                    pass
 
     def apply_bot_avatar(self):
-        Users = self.env['res.users'].sudo()
-        our = Users.search([('login','=','odoo_bot')], limit=1)
-        partner = our.partner_id if our else False
+        global _BOT_AVATAR_B64
+        partner = self.env['res.partner'].sudo().browse(self._cached_bot_partner_id())
         if not partner:
             return
         try:
-            path = get_module_resource('patco_ai', 'static', 'patco_odoo_bot.png')
-            if path:
-                with open(path, 'rb') as f:
-                    data = f.read()
-                partner.write({'image_1920': base64.b64encode(data)})
+            if _BOT_AVATAR_B64 is None:
+                path = get_module_resource('patco_ai', 'static', 'patco_odoo_bot.png')
+                if not path:
+                    return
+                with open(path, 'rb', buffering=65536) as f:
+                    _BOT_AVATAR_B64 = base64.b64encode(f.read())
+            partner.write({'image_1920': _BOT_AVATAR_B64})
         except Exception:
             pass
 
     def ensure_ai_params(self):
-        Users = self.env['res.users'].sudo()
-        # Identify our bot strictly by login/email 'odoo_bot'
-        our = Users.search(['|',('login','=','odoo_bot'),('email','=','odoo_bot')], limit=1)
-        icp = self.env['ir.config_parameter'].sudo()
-        if our and our.partner_id:
-            icp.set_param('ai.bot_partner_id', str(our.partner_id.id))
-        icp.set_param('ai.bot_aliases', 'odoo_bot,OdooBot,Odoo Bot')
+        params = {'ai.bot_aliases': 'odoo_bot,OdooBot,Odoo Bot'}
+        pid = self.env['ir.config_parameter'].sudo().get_param('ai.bot_partner_id')
+        partner = self.env['res.partner'].sudo().browse(int(pid)).exists() if pid else False
+        # Repair a stale parameter: the partner must still belong to the bot.
+        # The ormcached id is likely stale too at this point, resolve it again;
+        # _set_params_bulk clears the cache once the parameter is rewritten.
+        if not (partner and partner.user_ids.filtered(lambda u: u.login == 'odoo_bot')):
+            bot_partner_id = self._resolve_bot_user().partner_id.id
+            if bot_partner_id:
+                params['ai.bot_partner_id'] = str(bot_partner_id)
+        self._set_params_bulk(params)
 
     def clean_pycache(self):
         import os
         import shutil
         module_path = os.path.join('/mnt', 'extra-addons', 'patco_ai')
-        for root, dirs, files in os.walk(module_path):
-            for d in dirs:
-                if d == '__pycache__':
-                    p = os.path.join(root, d)
-                    try:
-                        shutil.rmtree(p)
-                    except Exception:
-                        pass
+        for root, dirs, _files in os.walk(module_path):
+            pycaches = [d for d in dirs if d == '__pycache__']
+            # Don't descend into directories we are about to remove
+            dirs[:] = [d for d in dirs if d != '__pycache__']
+            for d in pycaches:
+                shutil.rmtree(os.path.join(root, d), ignore_errors=True)
 
     def upgrade_module_self(self):
         Mod = self.env['ir.module.module'].sudo()
@@ -102,11 +155,19 @@ class PatcoAISetup(models.AbstractModel):
                     pass
 
     def configure_dev_icp(self):
-        icp = self.env['ir.config_parameter'].sudo()
-        icp.set_param('ai.rag_endpoint_base', 'http://patco-langgraph-server-dev:8001')
-        icp.set_param('ai.rag_endpoint', 'http://patco-langgraph-server-dev:8001/conversation/{conversation_id}/message')
-        icp.set_param('ai.rag_timeout', '20')
-        icp.set_param('ai.bot_require_mention', 'false')
+        self._set_params_bulk({
+            'ai.rag_endpoint_base': 'http://patco-langgraph-server-dev:8001',
+            'ai.rag_endpoint': 'http://patco-langgraph-server-dev:8001/conversation/{conversation_id}/message',
+            'ai.rag_timeout': '20',
+            'ai.bot_require_mention': 'false',
+        })
+
+    def _mark_requests_done(self, user_ids):
+        # maintenance.request.done is related to stage_id.done: write the
+        # stages once through the ORM so stored dependents (e.g. the equipment
+        # maintenance_open_count) are recomputed
+        requests = self.env['maintenance.request'].sudo().search([('user_id', 'in', list(user_ids))])
+        requests.stage_id.filtered(lambda stage: not stage.done).write({'done': True})
 
     def validate_end_to_end(self):
         Users = self.env['res.users'].sudo()
@@ -115,42 +176,82 @@ class PatcoAISetup(models.AbstractModel):
         ch = Channel.search([('name', '=', 'General')], limit=1)
         if not ch:
             ch = Channel.create({'name': 'General', 'channel_type': 'channel'})
+        mt_comment_id = self.env.ref('mail.mt_comment').id
+        # With patco_ai_fast_validation the messages are inserted with a batched
+        # create, skipping message_post (no notifications). The AI handler in
+        # mail.message.create still processes each of them.
+        fast = self.env.context.get('patco_ai_fast_validation')
+        msg_vals_list = []
+
+        def flush_posts():
+            if msg_vals_list:
+                self.env['mail.message'].sudo().create(msg_vals_list)
+                msg_vals_list.clear()
+
+        def post(body, author):
+            if fast:
+                msg_vals_list.append({
+                    'model': ch._name,
+                    'res_id': ch.id,
+                    'body': body,
+                    'author_id': author.partner_id.id,
+                    'message_type': 'comment',
+                    'subtype_id': mt_comment_id,
+                })
+                return
+            return ch.message_post(body=body, author_id=author.partner_id.id, message_type='comment', subtype_id=mt_comment_id)
+
         self.ensure_ai_params()
         pid = icp.get_param('ai.bot_partner_id')
         bot_partner = self.env['res.partner'].browse(int(pid)) if pid else False
         if not bot_partner:
-            bot_user = Users.search([('login', '=', 'odoo_bot')], limit=1)
-            bot_partner = bot_user.partner_id if bot_user else False
-        # Caso 1: cortesía
+            bot_partner = self.env['res.partner'].browse(self._cached_bot_partner_id())
         tester1 = Users.search([('login', '=', 'tester_ai_1')], limit=1)
         if not tester1:
             tester1 = Users.create({'name': 'Tester AI 1', 'login': 'tester_ai_1', 'email': 'tester_ai_1@example.com'})
-        self.env['maintenance.request'].sudo().search([('user_id', '=', tester1.id)]).write({'done': True})
-        ch.message_post(body='Ping sin orden', author_id=tester1.partner_id.id, message_type='comment', subtype_id=self.env.ref('mail.mt_comment').id)
-        # Caso 2: técnica
-        Equip = self.env['maintenance.equipment'].sudo()
-        Cat = self.env['maintenance.equipment.category'].sudo()
         tester2 = Users.search([('login', '=', 'tester_ai_2')], limit=1)
         if not tester2:
             tester2 = Users.create({'name': 'Tester AI 2', 'login': 'tester_ai_2', 'email': 'tester_ai_2@example.com'})
-        cat = Cat.create({'name': 'Bombas'})
-        eq = Equip.create({'name': 'Bomba #1', 'category_id': cat.id})
-        self.env['maintenance.request'].sudo().create({'name': 'Orden Test', 'equipment_id': eq.id, 'user_id': tester2.id})
-        ch.message_post(body='Ping con orden activa', author_id=tester2.partner_id.id, message_type='comment', subtype_id=self.env.ref('mail.mt_comment').id)
-        # Caso 3: error backend
-        base_prev = icp.get_param('ai.rag_endpoint_base')
-        icp.set_param('ai.rag_endpoint_base', 'http://127.0.0.1:5999')
         tester3 = Users.search([('login', '=', 'tester_ai_3')], limit=1)
         if not tester3:
             tester3 = Users.create({'name': 'Tester AI 3', 'login': 'tester_ai_3', 'email': 'tester_ai_3@example.com'})
-        self.env['maintenance.request'].sudo().search([('user_id', '=', tester3.id)]).write({'done': True})
-        ch.message_post(body='Ping con backend caído', author_id=tester3.partner_id.id, message_type='comment', subtype_id=self.env.ref('mail.mt_comment').id)
-        icp.set_param('ai.rag_endpoint_base', base_prev or 'http://patco-langgraph-server-dev:8001')
+        # Fetch the three authors' partner_id in one query
+        (tester1 | tester2 | tester3).mapped('partner_id')
+        # Casos 1 y 3 corren sin orden activa
+        ids_done = [tester1.id, tester3.id]
+        self._mark_requests_done(ids_done)
+        # Caso 1: cortesía
+        post('Ping sin orden', tester1)
+        # Caso 2: técnica
+        Equip = self.env['maintenance.equipment'].sudo()
+        Cat = self.env['maintenance.equipment.category'].sudo()
+        cat = Cat.search([('name', '=', 'Bombas')], limit=1) or Cat.create({'name': 'Bombas'})
+        # Scoped to the category so a customer's own 'Bomba #1' is never reused
+        eq = Equip.search([('name', '=', 'Bomba #1'), ('category_id', '=', cat.id)], limit=1) \
+            or Equip.create({'name': 'Bomba #1', 'category_id': cat.id})
+        self.env['maintenance.request'].sudo().create({'name': 'Orden Test', 'equipment_id': eq.id, 'user_id': tester2.id})
+        post('Ping con orden activa', tester2)
+        # Caso 3: error backend
+        # Casos 1 y 2 must be processed against the working endpoint
+        flush_posts()
+        with self._temp_param('ai.rag_endpoint_base', 'http://127.0.0.1:5999', 'http://patco-langgraph-server-dev:8001'):
+            post('Ping con backend caído', tester3)
+            flush_posts()
         return True
 
     def align_dev_and_validate(self):
         self.clean_pycache()
         # self.upgrade_module_self()
         self.configure_dev_icp()
-        self.validate_end_to_end()
+        # Caso 3 waits for the RAG timeout on purpose: hand it to a queue_job
+        # worker when the job runner is loaded (--load=base,web,queue_job or
+        # server_wide_modules in odoo.conf); otherwise the job would stay
+        # pending forever, so run it inline.
+        if 'queue_job' in odoo.conf.server_wide_modules:
+            self.with_delay(
+                channel='root.patco_ai',
+                description='PATCO AI: end-to-end validation',
+            ).validate_end_to_end()
+        else:
+            self.validate_end_to_end()
         return True
\ No newline at end of file
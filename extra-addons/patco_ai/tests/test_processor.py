@@ -2,22 +2,25 @@ from odoo.tests.common import TransactionCase
 
 
 class TestPatcoAIProcessor(TransactionCase):
-    def setUp(self):
-        super().setUp()
-        icp = self.env['ir.config_parameter'].sudo()
-        icp.set_param('ai.rag_endpoint_base', 'http://patco-langgraph-server-dev:8001')
-        icp.set_param('ai.rag_endpoint', 'http://patco-langgraph-server-dev:8001/conversation/{conversation_id}/message')
-        icp.set_param('ai.rag_timeout', '2')
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        icp = cls.env['ir.config_parameter'].sudo()
+        cls.env['patco.ai.setup']._set_params_bulk({
+            'ai.rag_endpoint_base': 'http://patco-langgraph-server-dev:8001',
+            'ai.rag_endpoint': 'http://patco-langgraph-server-dev:8001/conversation/{conversation_id}/message',
+            'ai.rag_timeout': '2',
+        })
 
         # Ensure bot
-        self.env['patco.ai.bot.user'].ensure_bot()
+        cls.env['patco.ai.bot.user'].ensure_bot()
 
         # Create a channel and user
-        # self.channel = self.env['discuss.channel'].sudo().create({
+        # cls.channel = cls.env['discuss.channel'].sudo().create({
         #     'name': 'Test General',
         #     'channel_type': 'channel',
         # })
-        # self.user = self.env['res.users'].sudo().create({
+        # cls.user = cls.env['res.users'].sudo().create({
         #     'name': 'Tester',
         #     'login': 'tester',
         #     'email': 'tester@example.com',
@@ -25,7 +28,7 @@ class TestPatcoAIProcessor(TransactionCase):
 
         # Get bot partner
         pid = icp.get_param('ai.bot_partner_id')
-        self.bot_partner = self.env['res.partner'].browse(int(pid)) if pid else self.env['res.users'].sudo().search([('login', '=', 'odoo_bot')], limit=1).partner_id
+        cls.bot_partner = cls.env['res.partner'].browse(int(pid) if pid else cls.env['patco.ai.setup']._cached_bot_partner_id())
 
     def _post_from(self, author_partner, body):
         return self.channel.sudo().with_context(ai_handler_invoked=False).message_post(
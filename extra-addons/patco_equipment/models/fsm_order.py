@@ -1,4 +1,5 @@
-from odoo import api, fields, models
+from odoo import fields, models
+from odoo.tools import SQL
 
 
 class FsmOrder(models.Model):
@@ -24,26 +25,58 @@ class FsmOrder(models.Model):
     x_all_equipment_codes = fields.Char(compute="_compute_equipment_meta")
     x_equipment_categories = fields.Many2many(
         "maintenance.equipment.category",
-        compute="_compute_equipment_categories",
+        compute="_compute_equipment_meta",
         string="Equipment Categories",
     )
 
-    @api.model_create_multi
-    def create(self, vals_list):
-        return super().create(vals_list)
-
     def _compute_equipment_meta(self):
-        for order in self:
-            eqs = order.x_equipment_ids or self.env["maintenance.equipment"]
+        # Aggregate in SQL so list views don't load every equipment record;
+        # new (onchange) records have no relation rows yet and stay in Python.
+        orders = self.filtered("id")
+        meta = orders._read_equipment_meta() if orders else {}
+        for order in orders:
+            count, code, codes, category_ids = meta.get(order.id, (0, None, None, []))
+            order.x_equipment_count = count
+            order.x_equipment_code = code or ""
+            order.x_all_equipment_codes = codes or ""
+            order.x_equipment_categories = self.env["maintenance.equipment.category"].browse(category_ids)
+        for order in self - orders:
+            eqs = order.x_equipment_ids
             order.x_equipment_count = len(eqs)
             order.x_equipment_code = eqs[:1].x_patco_code if eqs else ""
             order.x_all_equipment_codes = ", ".join(filter(None, eqs.mapped("x_patco_code")))
-
-    def _compute_equipment_categories(self):
-        for order in self:
-            eqs = order.x_equipment_ids or self.env["maintenance.equipment"]
             order.x_equipment_categories = eqs.mapped("category_id")
 
+    def _read_equipment_meta(self):
+        """Return ``{order_id: (count, first_code, codes, category_ids)}``.
+
+        Equipments are restricted by ``maintenance.equipment._search`` so that
+        archived records and record rules are honoured like a regular x2many read.
+        """
+        Equipment = self.env["maintenance.equipment"]
+        Equipment.flush_model(["x_patco_code", "category_id", "active"])
+        self.flush_model(["x_equipment_ids"])
+        self.env.cr.execute(SQL(
+            """
+            SELECT rel.order_id,
+                   COUNT(e.id),
+                   (ARRAY_AGG(e.x_patco_code ORDER BY e.id))[1],
+                   STRING_AGG(NULLIF(e.x_patco_code, ''), ', ' ORDER BY e.id),
+                   ARRAY_AGG(DISTINCT e.category_id) FILTER (WHERE e.category_id IS NOT NULL)
+              FROM fsm_order_equipment_rel rel
+              JOIN maintenance_equipment e ON e.id = rel.equipment_id
+             WHERE rel.order_id IN %s
+               AND e.id IN %s
+          GROUP BY rel.order_id
+            """,
+            tuple(self.ids),
+            Equipment._search([]).subselect(),
+        ))
+        return {
+            order_id: (count, code, codes, category_ids or [])
+            for order_id, count, code, codes, category_ids in self.env.cr.fetchall()
+        }
+
     def action_view_all_equipment(self):
         self.ensure_one()
         eqs = self.x_equipment_ids
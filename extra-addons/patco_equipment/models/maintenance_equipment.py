@@ -1,8 +1,33 @@
 import base64
+import functools
 import io
-import qrcode
 from odoo import api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import sql
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_qr_png(url):
+    """Return the QR code for ``url`` as raw PNG bytes.
+
+    Uses segno's native PNG writer when available, qrcode + Pillow otherwise.
+    Both are imported here so that loading the module doesn't pull in Pillow.
+    Results are memoized per process: the PNG depends on the URL only.
+    """
+    try:
+        import segno
+    except ImportError:
+        segno = None
+    buffer = io.BytesIO()
+    if segno:
+        segno.make(url, error='l', micro=False).save(buffer, kind='png', scale=10, border=4)
+    else:
+        import qrcode
+        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
+        qr.add_data(url)
+        qr.make(fit=True)
+        qr.make_image(fill_color='black', back_color='white').save(buffer, format='PNG')
+    return buffer.getvalue()
 
 
 class MaintenanceEquipment(models.Model):
@@ -12,8 +37,8 @@ class MaintenanceEquipment(models.Model):
     x_customer_id = fields.Many2one('res.partner', string='Customer', tracking=True)
     x_service_location_id = fields.Many2one('res.partner', string='Service Location', tracking=True)
     x_brand = fields.Char(string='Marca')
-    x_qr_code = fields.Binary(string='QR Code', readonly=True)
-    x_qr_url = fields.Char(string='QR URL', readonly=True)
+    x_qr_code = fields.Binary(string='QR Code', compute='_compute_qr_code', store=True, readonly=True, attachment=True)
+    x_qr_url = fields.Char(string='QR URL', compute='_compute_qr_code', store=True, readonly=True)
 
     x_service_order_ids = fields.Many2many(
         'fsm.order',
@@ -22,46 +47,59 @@ class MaintenanceEquipment(models.Model):
         'order_id',
         string='Service Orders'
     )
-    x_fsm_order_count = fields.Integer(string='FSM Orders', compute='_compute_fsm_order_count', store=True)
-    x_doc_entry_checklist = fields.Html(string='Entry Checklist', compute='_compute_doc_content', readonly=True)
-    x_doc_exit_checklist = fields.Html(string='Exit Checklist', compute='_compute_doc_content', readonly=True)
+    x_fsm_order_count = fields.Integer(string='FSM Orders', compute='_compute_fsm_order_count')
+    x_doc_entry_checklist = fields.Html(string='Entry Checklist', compute='_compute_doc_content', compute_sudo=True, readonly=True)
+    x_doc_exit_checklist = fields.Html(string='Exit Checklist', compute='_compute_doc_content', compute_sudo=True, readonly=True)
     x_doc_attachment_ids = fields.Many2many('ir.attachment', string='Effective Documents', compute='_compute_doc_attachments', readonly=True)
     technician_ids = fields.Many2many('res.users', 'maintenance_equipment_res_users_rel', 'equipment_id', 'user_id', string='Technicians')
     technician_id = fields.Many2one('res.users', string='Primary Technician')
 
+    def init(self):
+        # The ORM indexes fsm_order_equipment_rel in both directions only when
+        # it creates the table itself; make sure lookups by equipment_id (used
+        # to read x_service_order_ids) never fall back to a sequential scan.
+        cr = self.env.cr
+        cr.execute("""
+            SELECT 1
+              FROM pg_index i
+              JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+             WHERE i.indrelid = to_regclass('fsm_order_equipment_rel')
+               AND a.attname = 'equipment_id'
+        """)
+        if not cr.rowcount and sql.table_exists(cr, 'fsm_order_equipment_rel'):
+            sql.create_index(cr, 'fsm_order_equipment_rel_equipment_id_idx', 'fsm_order_equipment_rel', ['equipment_id', 'order_id'])
+
     @api.model_create_multi
     def create(self, vals_list):
         for vals in vals_list:
             if vals.get('x_patco_code', 'New') == 'New':
                 vals['x_patco_code'] = self.env['ir.sequence'].next_by_code('maintenance.equipment.patco') or 'New'
-        records = super().create(vals_list)
-        records._generate_qr_code()
-        return records
-
-    def write(self, vals):
-        result = super().write(vals)
-        qr_fields = ['name', 'x_patco_code', 'x_customer_id', 'x_service_location_id']
-        if any(field in vals for field in qr_fields):
-            self._generate_qr_code()
-        return result
-
-    def _generate_qr_code(self):
+        return super().create(vals_list)
+
+    @api.depends('name', 'x_patco_code', 'x_customer_id', 'x_service_location_id')
+    def _compute_qr_code(self):
+        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
         for record in self:
-            base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-            equipment_url = f"{base_url}/web#id={record.id}&model=maintenance.equipment&view_type=form"
-            qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
-            qr.add_data(equipment_url)
-            qr.make(fit=True)
-            img = qr.make_image(fill_color='black', back_color='white')
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            qr_image = base64.b64encode(buffer.getvalue())
-            record.sudo().write({'x_qr_code': qr_image, 'x_qr_url': equipment_url})
+            record_id = record._origin.id
+            if not record_id:
+                # Unsaved record: there is no form to link to yet
+                record.x_qr_url = False
+                record.x_qr_code = False
+                continue
+            equipment_url = f"{base_url}/web#id={record_id}&model=maintenance.equipment&view_type=form"
+            if record.x_qr_url == equipment_url:
+                # Same payload, same PNG: leaving both fields unassigned keeps
+                # the stored values instead of re-rendering the image.
+                continue
+            record.x_qr_url = equipment_url
+            record.x_qr_code = base64.b64encode(_render_qr_png(equipment_url))
 
     @api.depends('x_service_order_ids')
     def _compute_fsm_order_count(self):
+        order_data = self.env['fsm.order']._read_group([('x_equipment_ids', 'in', self.ids)], ['x_equipment_ids'], ['__count'])
+        mapped_data = {equipment.id: count for equipment, count in order_data}
         for record in self:
-            record.x_fsm_order_count = len(record.x_service_order_ids)
+            record.x_fsm_order_count = mapped_data.get(record.id, 0) if record.id else len(record.x_service_order_ids)
 
     def action_view_fsm_orders(self):
         self.ensure_one()
@@ -24,13 +24,15 @@ class AssignEquipmentWizard(models.TransientModel):
 
     equipment_id = fields.Many2one(
         "maintenance.equipment",
-        required=True,
+    )
+    equipment_ids = fields.Many2many(
+        "maintenance.equipment",
+        string="Equipos adicionales",
     )
     technician_id = fields.Many2one(
         "res.users",
         required=True,
         domain=[("share", "=", False)],
-        default=lambda self: self.env.user,
     )
     maintenance_type = fields.Selection(
         selection=[
@@ -47,34 +49,37 @@ class AssignEquipmentWizard(models.TransientModel):
         active_id = self.env.context.get("active_id")
         if active_id:
             res["fsm_order_id"] = active_id
+        if "technician_id" in fields_list and not res.get("technician_id"):
+            res["technician_id"] = self.env.uid
         return res
 
     def action_assign(self):
-        self.ensure_one()
-        order = self.fsm_order_id
-        if not (order.customer_id and order.location_id and order.request_early):
-            raise ValidationError(
-                "Complete los campos obligatorios de la orden (Cliente, Ubicación y Fecha)."
-            )
-        if not self.equipment_id:
-            raise ValidationError("Debe seleccionar un equipo")
-        if not self.technician_id:
-            raise ValidationError("Debe seleccionar un técnico")
+        Request = self.env["maintenance.request"]
+        maintenance_vals_list = []
+        for wizard in self:
+            order = wizard.fsm_order_id
+            if not (order.customer_id and order.location_id and order.request_early):
+                raise ValidationError(
+                    "Complete los campos obligatorios de la orden (Cliente, Ubicación y Fecha)."
+                )
+            equipments = wizard.equipment_id | wizard.equipment_ids
+            if not equipments:
+                raise ValidationError("Debe seleccionar un equipo")
+            if not wizard.technician_id:
+                raise ValidationError("Debe seleccionar un técnico")
 
-        if order.customer_id and self.equipment_id.x_customer_id != order.customer_id:
-            raise ValidationError("El equipo seleccionado no pertenece al cliente de la orden")
+            if order.customer_id and any(eq.x_customer_id != order.customer_id for eq in equipments):
+                raise ValidationError("El equipo seleccionado no pertenece al cliente de la orden")
 
-        if self.equipment_id not in order.x_equipment_ids:
-            order.x_equipment_ids = [(4, self.equipment_id.id)]
+            linked_ids = set(order.x_equipment_ids._ids)
+            missing = [eq.id for eq in equipments if eq.id not in linked_ids]
+            if missing:
+                order.x_equipment_ids = [(4, eq_id) for eq_id in missing]
 
-        maintenance_vals = {
-            "name": f"FSM {order.name} - {self.equipment_id.display_name}",
-            "equipment_id": self.equipment_id.id,
-            "user_id": self.technician_id.id,
-            "technician_id": self.technician_id.id,
-            "fsm_order_id": order.id,
-            "maintenance_type": self.maintenance_type,
-            "request_date": order.request_early,
-        }
-        self.env["maintenance.request"].create(maintenance_vals)
+            maintenance_vals_list += [{
+                **Request._prepare_from_fsm_order(order, equipment, wizard.technician_id),
+                "maintenance_type": wizard.maintenance_type,
+                "request_date": order.request_early,
+            } for equipment in equipments]
+        Request.create(maintenance_vals_list)
         return {"type": "ir.actions.act_window_close"}
\ No newline at end of file
@@ -1,7 +1,4 @@
-from odoo import models, fields, _
-import logging
-
-_logger = logging.getLogger(__name__)
+from odoo import models, fields
 
 
 class FsmPerson(models.Model):
@@ -10,21 +7,20 @@ class FsmPerson(models.Model):
     x_employee_id = fields.Many2one('hr.employee', string='Employee')
 
     def action_update_from_employee(self):
+        employees = self.x_employee_id
+        # Load only the columns used below instead of every hr.employee field
+        employees.fetch([
+            fname for fname in ('name', 'work_phone', 'mobile_phone', 'work_email',
+                                'work_contact_id', 'user_id', 'company_id')
+            if fname in employees._fields
+        ])
+        employees.user_id.fetch(['partner_id'])
+        employees.company_id.fetch(['partner_id'])
+        partner_by_emp = employees._resolve_partners()
         for worker in self:
             emp = worker.x_employee_id
             if not emp:
                 continue
-            partner = getattr(emp, 'work_contact_id', False) or getattr(emp.user_id, 'partner_id', False) or getattr(emp.company_id, 'partner_id', False)
-            if not partner:
-                partner = self.env['res.partner'].create({'name': emp.name or _('Employee')})
-                _logger.info('Created fallback partner %s for employee %s', partner.id, emp.id)
-            vals = {
-                'name': emp.name,
-                'partner_id': partner.id,
-                'phone': getattr(emp, 'work_phone', False),
-                'mobile': getattr(emp, 'mobile_phone', False),
-                'email': getattr(emp, 'work_email', False),
-                'active': True,
-            }
+            vals = employees._build_fsm_vals(emp, partner_by_emp[emp.id])
             worker.write(vals | {'x_employee_id': emp.id})
-        return True
\ No newline at end of file
+        return True
@@ -1,4 +1,5 @@
 from odoo import models, fields, api, _
+from odoo.tools import SQL
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -10,13 +11,30 @@ class HrEmployee(models.Model):
     x_is_fsm_worker = fields.Boolean(string='FSM Worker')
     x_fsm_person_id = fields.Many2one('fsm.person', string='FSM Worker')
 
-    def _get_partner_for_employee(self):
+    def _resolve_partners(self):
+        """Return ``{employee_id: partner}`` for the employees in ``self``.
+
+        Missing partners are created in a single batch.
+        """
+        # Warm the cache so the chain below costs a few SELECTs, not 3 per employee
+        for path in ('work_contact_id', 'user_id.partner_id', 'company_id.partner_id'):
+            if path.split('.')[0] in self._fields:
+                self.mapped(path)
+        partners = {}
+        needs_partner_ids = []
         for emp in self:
             partner = getattr(emp, 'work_contact_id', False) or getattr(emp.user_id, 'partner_id', False) or getattr(emp, 'company_id', False) and emp.company_id.partner_id
-            if not partner:
-                partner = self.env['res.partner'].create({'name': emp.name or _('Employee')})
+            if partner:
+                partners[emp.id] = partner
+            else:
+                needs_partner_ids.append(emp.id)
+        if needs_partner_ids:
+            needs_partner = self.browse(needs_partner_ids)
+            created = self.env['res.partner'].create([{'name': emp.name or _('Employee')} for emp in needs_partner])
+            for emp, partner in zip(needs_partner, created):
                 _logger.info('Created fallback partner %s for employee %s', partner.id, emp.id)
-            yield emp, partner
+                partners[emp.id] = partner
+        return partners
 
     def _build_fsm_vals(self, emp, partner):
         phone = getattr(emp, 'work_phone', False)
@@ -31,32 +49,97 @@ class HrEmployee(models.Model):
             'active': True,
         }
 
+    def _find_fsm_persons(self, partner_by_emp):
+        """Look up the existing FSM workers of ``self`` with a single search.
+
+        :param partner_by_emp: ``{employee_id: partner}`` as returned by
+            :meth:`_resolve_partners`
+        :return: ``(by_emp, by_partner)`` dicts mapping employee and partner
+            ids to ``fsm.person`` records
+        """
+        by_emp, by_partner = {}, {}
+        if not self:
+            return by_emp, by_partner
+        # Reusar existente si está vinculado por empleado o partner: una sola búsqueda
+        existing = self.env['fsm.person'].search([
+            '|',
+            ('x_employee_id', 'in', self.ids),
+            ('partner_id', 'in', [partner_by_emp[emp.id].id for emp in self]),
+        ])
+        for person in existing:
+            if person.x_employee_id:
+                by_emp.setdefault(person.x_employee_id.id, person)
+            if person.partner_id:
+                by_partner.setdefault(person.partner_id.id, person)
+        return by_emp, by_partner
+
+    def _link_fsm_persons(self, fsm_by_emp):
+        """Set ``x_fsm_person_id`` from ``{employee_id: fsm_person_id}`` and
+        flag the employees as FSM workers, in a single UPDATE."""
+        if not fsm_by_emp:
+            return
+        employees = self.browse(fsm_by_emp)
+        # Raw SQL bypasses the ORM: enforce the same ACLs and record rules as write()
+        employees.check_access('write')
+        self.flush_model(['x_fsm_person_id', 'x_is_fsm_worker'])
+        self.env.cr.execute(SQL(
+            """
+            UPDATE hr_employee AS e
+               SET x_fsm_person_id = v.fsm_id,
+                   x_is_fsm_worker = TRUE,
+                   write_uid = %s,
+                   write_date = %s
+              FROM (VALUES %s) AS v(emp_id, fsm_id)
+             WHERE e.id = v.emp_id
+            """,
+            self.env.uid,
+            self.env.cr.now(),
+            SQL(", ").join(SQL("(%s, %s)", emp_id, fsm_id) for emp_id, fsm_id in fsm_by_emp.items()),
+        ))
+        employees.invalidate_recordset(['x_fsm_person_id', 'x_is_fsm_worker', 'write_uid', 'write_date'])
+
     @api.model_create_multi
     def create(self, vals_list):
         employees = super().create(vals_list)
-        for emp in employees:
-            if emp.x_is_fsm_worker and not emp.x_fsm_person_id:
-                for _emp, partner in emp._get_partner_for_employee():
-                    # Reusar existente si está vinculado por empleado o partner
-                    fsm = self.env['fsm.person'].search([('x_employee_id', '=', emp.id)], limit=1) or \
-                          self.env['fsm.person'].search([('partner_id', '=', partner.id)], limit=1)
-                    if fsm:
-                        fsm.write(self._build_fsm_vals(emp, partner))
-                    else:
-                        fsm = self.env['fsm.person'].create({**self._build_fsm_vals(emp, partner), 'x_employee_id': emp.id})
-                    emp.x_fsm_person_id = fsm.id
+        candidates = employees.filtered(lambda e: e.x_is_fsm_worker and not e.x_fsm_person_id)
+        if not candidates:
+            return employees
+        partner_by_emp = candidates._resolve_partners()
+        by_emp, by_partner = candidates._find_fsm_persons(partner_by_emp)
+        fsm_by_emp = {}
+        # Un solo create para los nuevos; empleados que comparten partner comparten worker
+        pending = {}
+        for emp in candidates:
+            partner = partner_by_emp[emp.id]
+            fsm = by_emp.get(emp.id) or by_partner.get(partner.id)
+            if fsm:
+                fsm.write(self._build_fsm_vals(emp, partner))
+                fsm_by_emp[emp.id] = fsm.id
+            elif partner.id in pending:
+                pending[partner.id][1].append(emp.id)
+            else:
+                pending[partner.id] = ({**self._build_fsm_vals(emp, partner), 'x_employee_id': emp.id}, [emp.id])
+        if pending:
+            created = self.env['fsm.person'].create([vals for vals, _emp_ids in pending.values()])
+            for fsm, (_vals, emp_ids) in zip(created, pending.values()):
+                fsm_by_emp.update(dict.fromkeys(emp_ids, fsm.id))
+        candidates._link_fsm_persons(fsm_by_emp)
         return employees
 
     def action_sync_to_fsm(self):
+        partner_by_emp = self._resolve_partners()
+        # Only employees not linked yet need a lookup
+        by_emp, by_partner = self.filtered(lambda e: not e.x_fsm_person_id)._find_fsm_persons(partner_by_emp)
+        fsm_by_emp = {}
         for emp in self:
-            for _emp, partner in emp._get_partner_for_employee():
-                fsm = emp.x_fsm_person_id or \
-                      self.env['fsm.person'].search([('x_employee_id', '=', emp.id)], limit=1) or \
-                      self.env['fsm.person'].search([('partner_id', '=', partner.id)], limit=1)
-                vals = self._build_fsm_vals(emp, partner)
-                if fsm:
-                    fsm.write(vals | {'x_employee_id': emp.id})
-                else:
-                    fsm = self.env['fsm.person'].create(vals | {'x_employee_id': emp.id})
-                emp.write({'x_fsm_person_id': fsm.id, 'x_is_fsm_worker': True})
-        return True
\ No newline at end of file
+            partner = partner_by_emp[emp.id]
+            fsm = emp.x_fsm_person_id or by_emp.get(emp.id) or by_partner.get(partner.id)
+            vals = self._build_fsm_vals(emp, partner)
+            if fsm:
+                fsm.write(vals | {'x_employee_id': emp.id})
+            else:
+                fsm = self.env['fsm.person'].create(vals | {'x_employee_id': emp.id})
+                by_partner.setdefault(partner.id, fsm)
+            fsm_by_emp[emp.id] = fsm.id
+        self._link_fsm_persons(fsm_by_emp)
+        return True
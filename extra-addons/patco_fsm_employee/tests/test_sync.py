@@ -23,4 +23,25 @@ class TestFsmEmployeeSync(TransactionCase):
         self.assertTrue(emp.x_fsm_person_id)
         emp.name = 'Jane Updated'
         emp.action_sync_to_fsm()
-        self.assertEqual(emp.x_fsm_person_id.name, 'Jane Updated')
\ No newline at end of file
+        self.assertEqual(emp.x_fsm_person_id.name, 'Jane Updated')
+
+    def test_create_batch_shares_worker_per_partner(self):
+        emps = self.emp_model.create([
+            {'name': 'Ann', 'work_contact_id': self.partner.id, 'x_is_fsm_worker': True},
+            {'name': 'Bob', 'work_contact_id': self.partner.id, 'x_is_fsm_worker': True},
+        ])
+        self.assertTrue(emps[0].x_fsm_person_id)
+        self.assertEqual(emps[0].x_fsm_person_id, emps[1].x_fsm_person_id)
+        self.assertEqual(self.fsm_model.search_count([('partner_id', '=', self.partner.id)]), 1)
+        self.assertTrue(all(emps.mapped('x_is_fsm_worker')))
+
+    def test_create_reuses_worker_matched_by_partner(self):
+        fsm = self.fsm_model.create({'name': 'Old Name', 'partner_id': self.partner.id})
+        emp = self.emp_model.create({
+            'name': 'Carl',
+            'work_contact_id': self.partner.id,
+            'x_is_fsm_worker': True,
+        })
+        self.assertEqual(emp.x_fsm_person_id, fsm)
+        self.assertTrue(emp.x_is_fsm_worker)
+        self.assertEqual(fsm.name, 'Carl')
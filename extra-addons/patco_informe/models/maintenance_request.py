@@ -22,28 +22,29 @@ class MaintenanceRequest(models.Model):
     @api.depends('report_start_datetime', 'report_end_datetime')
     def _compute_report_duration(self):
         for rec in self:
-            if rec.report_start_datetime and rec.report_end_datetime and rec.report_end_datetime >= rec.report_start_datetime:
-                delta = rec.report_end_datetime - rec.report_start_datetime
-                rec.report_duration_hours = delta.total_seconds() / 3600.0
-            else:
-                rec.report_duration_hours = 0.0
+            start, end = rec.report_start_datetime, rec.report_end_datetime
+            seconds = (end - start).total_seconds() if start and end else 0.0
+            rec.report_duration_hours = max(seconds, 0.0) / 3600.0
 
     def _compute_informe_count(self):
+        image_data = self.env['maintenance.request.image']._read_group([('request_id', 'in', self.ids)], ['request_id'], ['__count'])
+        with_images = {request.id for request, count in image_data}
         for rec in self:
-            rec.informe_count = 1 if rec.report_started or rec.report_notes or rec.report_image_ids else 0
+            has_images = rec.id in with_images if rec.id else bool(rec.report_image_ids)
+            rec.informe_count = 1 if rec.report_started or rec.report_notes or has_images else 0
 
     def action_start_report(self):
-        for rec in self:
-            if not rec.report_started:
-                rec.report_started = True
-                rec.report_start_datetime = fields.Datetime.now()
+        to_start = self.filtered(lambda rec: not rec.report_started)
+        to_start.write({
+            'report_started': True,
+            'report_start_datetime': fields.Datetime.now(),
+        })
 
     def action_finish_report(self):
-        for rec in self:
-            if rec.report_started and not rec.report_end_datetime:
-                if not rec.report_notes and not rec.report_image_ids:
-                    raise UserError('Para finalizar el reporte, agrega notas o al menos una foto.')
-                rec.report_end_datetime = fields.Datetime.now()
+        to_finish = self.filtered(lambda rec: rec.report_started and not rec.report_end_datetime)
+        if any(not rec.report_notes and not rec.report_image_ids for rec in to_finish):
+            raise UserError('Para finalizar el reporte, agrega notas o al menos una foto.')
+        to_finish.write({'report_end_datetime': fields.Datetime.now()})
 
     def action_add_photo(self):
         self.ensure_one()
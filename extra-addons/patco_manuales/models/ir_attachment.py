@@ -1,30 +1,26 @@
-from odoo import models, fields
+from odoo import models, fields, api
+
+_INLINE_MIMETYPES = frozenset({
+    'application/pdf',
+    'image/png', 'image/jpeg', 'image/jpg', 'image/webp',
+    'image/gif', 'image/bmp', 'image/tiff', 'image/svg+xml',
+})
 
 
 class IrAttachment(models.Model):
     _inherit = 'ir.attachment'
 
-    inline_url = fields.Char(compute='_compute_inline_url', string='Inline URL', store=False)
-    inline_supported = fields.Boolean(compute='_compute_inline_supported', string='Inline Supported', store=False)
-
-    def _compute_inline_url(self):
-        for att in self:
-            url = False
-            if att.type == 'binary':
-                url = f"/web/content/{att.id}?download=false"
-            att.inline_url = url
+    inline_url = fields.Char(compute='_compute_inline', string='Inline URL', store=False)
+    inline_supported = fields.Boolean(compute='_compute_inline', string='Inline Supported', store=False)
 
-    def _compute_inline_supported(self):
-        supported_images = {
-            'image/png', 'image/jpeg', 'image/jpg', 'image/webp',
-            'image/gif', 'image/bmp', 'image/tiff', 'image/svg+xml'
-        }
+    @api.depends('type', 'mimetype')
+    def _compute_inline(self):
+        # Only load the columns we need instead of the whole prefetch group
+        self.fetch(['type', 'mimetype'])
         for att in self:
-            att.inline_supported = bool(
-                att.type == 'binary' and (
-                    att.mimetype == 'application/pdf' or (att.mimetype in supported_images)
-                )
-            )
+            is_binary = att.type == 'binary'
+            att.inline_url = is_binary and f"/web/content/{att.id}?download=false"
+            att.inline_supported = is_binary and att.mimetype in _INLINE_MIMETYPES
 
     def action_open_inline_url(self):
         self.ensure_one()
@@ -1,5 +1,5 @@
-from odoo import models, fields, api
-import base64
+from odoo import models, fields, api, tools
+from markupsafe import Markup
 import zipfile
 import io
 
@@ -35,28 +35,56 @@ class MaintenanceEquipmentCategory(models.Model):
 
     @api.depends('x_entry_checklist_template', 'x_exit_checklist_template', 'parent_id.x_effective_entry_checklist', 'parent_id.x_effective_exit_checklist', 'x_inherit_checklists')
     def _compute_effective_checklists(self):
+        # Memoize (entry, exit) per category id: every ancestor is evaluated
+        # once for the whole batch instead of once per descendant and level.
+        effective = {}
+        titles = {}
+        entry_field = self._fields['x_effective_entry_checklist']
+        exit_field = self._fields['x_effective_exit_checklist']
         for record in self:
-            if record.x_inherit_checklists and record.parent_id:
-                entry_sections = []
-                exit_sections = []
-                if record.x_entry_checklist_template:
-                    entry_sections.append(record.x_entry_checklist_template)
-                if record.x_exit_checklist_template:
-                    exit_sections.append(record.x_exit_checklist_template)
-                current = record.parent_id
-                while current:
-                    if current.x_effective_entry_checklist:
-                        title = f"<h5>Checklist del {current.complete_name or current.name}</h5><hr/>"
-                        entry_sections.append(title + current.x_effective_entry_checklist)
-                    if current.x_effective_exit_checklist:
-                        title = f"<h5>Checklist del {current.complete_name or current.name}</h5><hr/>"
-                        exit_sections.append(title + current.x_effective_exit_checklist)
-                    current = current.parent_id
-                record.x_effective_entry_checklist = '\n'.join(entry_sections) if entry_sections else False
-                record.x_effective_exit_checklist = '\n'.join(exit_sections) if exit_sections else False
-            else:
-                record.x_effective_entry_checklist = record.x_entry_checklist_template or False
-                record.x_effective_exit_checklist = record.x_exit_checklist_template or False
+            chain = []
+            current = record
+            while current and current.id not in effective:
+                chain.append(current)
+                current = current.parent_id
+            for category in reversed(chain):
+                entry, exit = category._build_effective_checklists(effective, titles)
+                # Keep the values as reading the field would return them
+                effective[category.id] = (
+                    entry_field.convert_to_record(entry_field.convert_to_cache(entry, category), category),
+                    exit_field.convert_to_record(exit_field.convert_to_cache(exit, category), category),
+                )
+            record.x_effective_entry_checklist, record.x_effective_exit_checklist = effective[record.id]
+
+    def _build_effective_checklists(self, effective, titles):
+        """Return the (entry, exit) checklists of ``self`` given the already
+        computed ``effective`` values of all its ancestors. ``titles`` caches
+        the section heading of each ancestor across calls."""
+        self.ensure_one()
+        if not (self.x_inherit_checklists and self.parent_id):
+            return self.x_entry_checklist_template or False, self.x_exit_checklist_template or False
+        entry_sections = []
+        exit_sections = []
+        if self.x_entry_checklist_template:
+            entry_sections.append(self.x_entry_checklist_template)
+        if self.x_exit_checklist_template:
+            exit_sections.append(self.x_exit_checklist_template)
+        current = self.parent_id
+        while current:
+            parent_entry, parent_exit = effective[current.id]
+            if parent_entry or parent_exit:
+                if current.id not in titles:
+                    titles[current.id] = Markup("<h5>Checklist del %s</h5><hr/>") % (current.complete_name or current.name)
+                title = titles[current.id]
+                if parent_entry:
+                    entry_sections.append(title + parent_entry)
+                if parent_exit:
+                    exit_sections.append(title + parent_exit)
+            current = current.parent_id
+        return (
+            Markup('\n').join(entry_sections) if entry_sections else False,
+            Markup('\n').join(exit_sections) if exit_sections else False,
+        )
 
     @api.depends('parent_id', 'x_inherit_knowledge_base')
     def _compute_inherited_knowledge_count(self):
@@ -67,26 +95,73 @@ class MaintenanceEquipmentCategory(models.Model):
                     inherited_count += len(parent.x_attachment_ids)
             record.x_inherited_knowledge_count = inherited_count
 
-    def _get_parent_categories(self):
-        parents = self.env['maintenance.equipment.category']
+    def write(self, vals):
+        res = super().write(vals)
+        if 'parent_id' in vals:
+            # Ancestor chains are memoized in _get_parent_categories_ids_cached
+            self.env.registry.clear_cache()
+        return res
+
+    def _get_parent_categories_ids(self):
+        """Return the ids of the ancestors of ``self``, nearest first."""
+        if isinstance(self.id, int):
+            return self._get_parent_categories_ids_cached()
+        # NewIds compare equal across onchanges with a different parent_id
+        return self._walk_parent_categories_ids()
+
+    @tools.ormcache('self.id')
+    def _get_parent_categories_ids_cached(self):
+        return self._walk_parent_categories_ids()
+
+    def _walk_parent_categories_ids(self):
+        # A NewId reads its origin's stored parent_path, which predates any
+        # parent_id change made in the form
+        if self.id and self.parent_path:
+            # 'root/.../parent/self/' already holds the whole chain
+            return tuple(int(id_) for id_ in self.parent_path.split('/')[-3::-1])
+        ids = []
         current = self.parent_id
         while current:
-            parents |= current
+            ids.append(current.id)
             current = current.parent_id
-        return parents
+        return tuple(dict.fromkeys(ids))
+
+    def _get_parent_categories(self):
+        return self.browse(self._get_parent_categories_ids())
 
     def _get_all_attachments(self):
         self.ensure_one()
-        all_attachments = self.x_attachment_ids
-        if self.x_inherit_knowledge_base and self.parent_id:
-            for parent in self._get_parent_categories():
-                all_attachments |= parent.x_attachment_ids
-        return all_attachments
+        if not (self.x_inherit_knowledge_base and self.parent_id):
+            return self.x_attachment_ids
+        category_ids = [self.id, *self._get_parent_categories_ids()]
+        return self.env['ir.attachment'].search([
+            ('res_model', '=', self._name),
+            ('res_id', 'in', category_ids),
+        ])
 
     def _compute_effective_attachments(self):
+        # Siblings share ancestors: load the documents of every category
+        # involved with one search instead of one per record
+        chains = {
+            record.id: [record._origin.id, *record._get_parent_categories_ids()]
+            for record in self
+            if record.x_inherit_knowledge_base and record.parent_id
+        }
+        Attachment = self.env['ir.attachment']
+        by_category = {}
+        if chains:
+            category_ids = {category_id for chain in chains.values() for category_id in chain if category_id}
+            by_category = Attachment.search([
+                ('res_model', '=', self._name),
+                ('res_id', 'in', list(category_ids)),
+            ]).grouped('res_id')
         for record in self:
-            attachments = record._get_all_attachments() if (record.x_inherit_knowledge_base and record.parent_id) else record.x_attachment_ids
-            record.x_effective_attachment_ids = attachments
+            if record.id in chains:
+                record.x_effective_attachment_ids = Attachment.union(
+                    *(by_category.get(category_id, Attachment) for category_id in chains[record.id])
+                )
+            else:
+                record.x_effective_attachment_ids = record.x_attachment_ids
 
     def action_view_knowledge_base(self):
         self.ensure_one()
@@ -139,21 +214,22 @@ class MaintenanceEquipmentCategory(models.Model):
                     'sticky': False,
                 },
             }
+        # One query for every column the loop reads (raw is computed from
+        # store_fname/db_datas) instead of lazy per-field fetches
+        all_attachments.fetch(['name', 'res_id', 'store_fname', 'db_datas'])
         zip_buffer = io.BytesIO()
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
             for attachment in all_attachments:
-                if attachment.datas:
+                # raw skips the base64 encode/decode round trip of datas
+                file_data = attachment.raw
+                if file_data:
                     folder = 'Own' if attachment.res_id == self.id else 'Inherited'
-                    file_path = f"{folder}/{attachment.name}"
-                    file_data = base64.b64decode(attachment.datas)
-                    zip_file.writestr(file_path, file_data)
-        zip_buffer.seek(0)
-        zip_data = base64.b64encode(zip_buffer.getvalue()).decode()
+                    zip_file.writestr(f"{folder}/{attachment.name}", file_data)
         zip_name = f"Docs_{self.name.replace(' ', '_')}_{fields.Date.today().strftime('%Y%m%d')}.zip"
         zip_attachment = self.env['ir.attachment'].create({
             'name': zip_name,
             'type': 'binary',
-            'raw': zip_data,
+            'raw': zip_buffer.getvalue(),
             'res_model': 'maintenance.equipment.category',
             'res_id': self.id,
             'mimetype': 'application/zip',
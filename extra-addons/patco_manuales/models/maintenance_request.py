@@ -16,13 +16,11 @@ class MaintenanceRequest(models.Model):
     x_req_attachment_ids = fields.Many2many('ir.attachment', string='Effective Documents', compute='_compute_req_attachments', readonly=True)
 
     def _compute_history_request_ids(self):
+        # One search for every equipment in the batch, bucketed in Python
+        Request = self.env['maintenance.request']
+        history = Request.search([('equipment_id', 'in', self.equipment_id.ids)]).grouped('equipment_id') if self.equipment_id else {}
         for record in self:
-            if record.equipment_id:
-                record.x_history_request_ids = self.env['maintenance.request'].search([
-                    ('equipment_id', '=', record.equipment_id.id)
-                ])
-            else:
-                record.x_history_request_ids = self.env['maintenance.request']
+            record.x_history_request_ids = history.get(record.equipment_id, Request) if record.equipment_id else Request
 
     def _compute_req_attachments(self):
         for record in self: